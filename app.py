@@ -3,12 +3,17 @@
 
 import io
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import pandas as pd
 import streamlit as st
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Inches
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from xml.sax.saxutils import escape
 
 from database import Database
 
@@ -39,6 +44,9 @@ EMPTY_WORDS = [
     "之",
 ]
 
+# 虚词集合（O(1) 成员判断用）
+EMPTY_WORDS_SET = frozenset(EMPTY_WORDS)
+
 # 词性列表（存储用英文）
 PART_OF_SPEECH = [
     "VERB",
@@ -70,20 +78,189 @@ PART_OF_SPEECH_ZH = {
 # 词性中文到英文的映射（反向）
 PART_OF_SPEECH_EN = {v: k for k, v in PART_OF_SPEECH_ZH.items()}
 
+# 词性中文选项及其下标（模块级算一次，避免每个表单重建）
+POS_OPTIONS_ZH = [PART_OF_SPEECH_ZH[p] for p in PART_OF_SPEECH]
+POS_OPTIONS_ZH_INDEX = {zh: i for i, zh in enumerate(POS_OPTIONS_ZH)}
+
+# 按中文排序的全部词性（试卷生成"全选"逻辑用）
+ALL_POS_ZH_SORTED = sorted(PART_OF_SPEECH_ZH.values())
+ALL_POS_EN_SORTED = [PART_OF_SPEECH_EN[zh] for zh in ALL_POS_ZH_SORTED]
+
 
 def get_pos_display(pos_code: str) -> str:
     """获取词性的中文显示"""
     return PART_OF_SPEECH_ZH.get(pos_code, pos_code)
 
 
-# 初始化数据库
+# 初始化数据库：每个脚本线程一个 Database 实例，
+# 多会话并发时互不争用（配合 WAL 读写不互斥）
 @st.cache_resource
-def get_db():
-    return Database()
+def _get_db_holder():
+    return threading.local()
+
+
+def get_db() -> Database:
+    holder = _get_db_holder()
+    if not hasattr(holder, "db"):
+        holder.db = Database()
+    return holder.db
 
 
 db = get_db()
 
+
+# 读查询缓存：Streamlit 每次交互都会重跑整个脚本，
+# 用 ver 计数器在写操作后手动失效
+def _data_ver() -> int:
+    return st.session_state.setdefault("data_ver", 0)
+
+
+def _bump_data_ver():
+    st.session_state["data_ver"] = st.session_state.get("data_ver", 0) + 1
+
+
+# 列表页每页行数
+PAGE_SIZE = 50
+
+
+@st.cache_data(ttl=30)
+def _cached_actions(filter_word, ver, limit=None, offset=0):
+    return db.get_all_empty_word_actions(filter_word, limit=limit, offset=offset)
+
+
+@st.cache_data(ttl=30)
+def _cached_action_count(filter_word, ver):
+    return db.count_empty_word_actions(filter_word)
+
+
+@st.cache_data(ttl=30)
+def _cached_example_sentences(filter_word, ver, limit=None, offset=0):
+    return db.get_all_example_sentences(filter_word, limit=limit, offset=offset)
+
+
+@st.cache_data(ttl=30)
+def _cached_example_sentence_count(filter_word, ver):
+    return db.count_example_sentences(filter_word)
+
+
+@st.cache_data(ttl=30)
+def _cached_sentences(filter_word, ver):
+    return db.get_all_sentences(filter_word)
+
+
+@st.cache_data(ttl=30)
+def _cached_pos_for_words(words, ver):
+    return db.get_distinct_parts_of_speech(list(words))
+
+
+# 导出线程池：Word 生成不占用 Streamlit 脚本线程
+@st.cache_resource
+def get_executor():
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def _append_paragraph_xml(doc, runs, indent=False):
+    """直接拼 <w:p> XML 追加到文档，跳过 python-docx 逐段逐 run 的对象构建
+
+    runs: [(text, bold), ...]
+    """
+    ppr = '<w:pPr><w:ind w:left="720"/></w:pPr>' if indent else ""
+    run_parts = []
+    for text, bold in runs:
+        rpr = "<w:rPr><w:b/></w:rPr>" if bold else ""
+        run_parts.append(
+            f'<w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+        )
+    elem = parse_xml(f"<w:p {nsdecls('w')}>{ppr}{''.join(run_parts)}</w:p>")
+    # insert_element_before 接受带前缀的标签名并在内部做 qn 转换
+    doc.element.body.insert_element_before(elem, "w:sectPr")
+
+
+def _build_docx(paper, show_options, show_answer, highlight_word) -> bytes:
+    """生成试卷 Word 文档，返回字节内容"""
+    doc = Document()
+
+    # 标题
+    title = doc.add_heading(paper["title"], 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    # 添加空行
+    _append_paragraph_xml(doc, [])
+
+    # 题目
+    for i, question_data in enumerate(paper["questions"], 1):
+        # 获取句子
+        sentence = question_data.get("sentence", "")
+
+        # 题号 + 句子（高亮时虚词单独加粗一个 run）
+        runs = [(f"{i}. ", False)]
+        if highlight_word and sentence:
+            # 单次遍历句子找到第一个虚词
+            empty_word = next((c for c in sentence if c in EMPTY_WORDS_SET), None)
+
+            if empty_word:
+                # 找到虚词在句子中的位置
+                parts = sentence.split(empty_word, 1)
+                if parts[0]:
+                    runs.append((parts[0], False))
+                runs.append((empty_word, True))
+                if len(parts) > 1 and parts[1]:
+                    runs.append((parts[1], False))
+            else:
+                runs.append((sentence, False))
+        elif sentence:
+            runs.append((sentence, False))
+        _append_paragraph_xml(doc, runs)
+
+        # 选项
+        if show_options and question_data.get("options"):
+            options = question_data["options"]
+            for j, option in enumerate(options, 1):
+                # 构建选项文本：作用 + 意思
+                action = option.get("action", "")
+                translation = option.get("translation", "")
+                if translation:
+                    option_text = f"{chr(96 + j)}. {action}（{translation}）"
+                else:
+                    option_text = f"{chr(96 + j)}. {action}"
+                _append_paragraph_xml(doc, [(option_text, False)], indent=True)
+
+        # 答案
+        if show_answer:
+            options = question_data.get("options", [])
+            correct_answer = next(
+                (opt for opt in options if opt.get("is_correct")), None
+            )
+            if correct_answer:
+                action = correct_answer.get("action", "")
+                translation = correct_answer.get("translation", "")
+                if translation:
+                    answer_text = f"答案: {action}（{translation}）"
+                else:
+                    answer_text = f"答案: {action}"
+                _append_paragraph_xml(doc, [(answer_text, False)], indent=True)
+
+        # 只有在有选项或答案时才添加空行（默认导出版面更紧凑）
+        if show_options and question_data.get("options"):
+            _append_paragraph_xml(doc, [])  # 空行
+        elif show_answer:
+            _append_paragraph_xml(doc, [])  # 空行
+
+    # 保存到内存
+    doc_io = io.BytesIO()
+    doc.save(doc_io)
+    return doc_io.getvalue()
+
+
+# 相同试卷 + 相同导出选项直接复用上次生成的字节
+@st.cache_data(max_entries=32)
+def build_docx_bytes(
+    paper_id, show_options, show_answer, highlight_word, ver
+) -> bytes:
+    paper = db.get_paper(paper_id)
+    return _build_docx(paper, show_options, show_answer, highlight_word)
+
+
 # 侧边栏
 st.sidebar.title("虚词大战")
 st.sidebar.markdown("---")
@@ -108,76 +285,93 @@ if page == "数据管理":
                 filter_empty_word = None
                 st.rerun()
 
-        # 获取数据
-        actions = db.get_all_empty_word_actions(filter_empty_word)
+        # 列表 + 编辑/删除放进 fragment：增删改只重跑本片段，不重跑整页
+        @st.fragment
+        def actions_list_fragment(filter_empty_word):
+            # 获取数据（服务端分页，只取当前页）
+            total_actions = _cached_action_count(filter_empty_word, _data_ver())
+            st.markdown(f"### 共 {total_actions} 个虚词用法")
+
+            max_page = max(1, (total_actions + PAGE_SIZE - 1) // PAGE_SIZE)
+            page_no = st.number_input(
+                "页码", min_value=1, max_value=max_page, value=1, key="actions_page"
+            )
+            actions = _cached_actions(
+                filter_empty_word,
+                _data_ver(),
+                limit=PAGE_SIZE,
+                offset=(page_no - 1) * PAGE_SIZE,
+            )
+
+            # 单个表格组件渲染全部行，选中某行后再展示编辑/删除
+            if actions:
+                df = pd.DataFrame(actions)[
+                    ["id", "empty_word", "part_of_speech", "action", "translation"]
+                ]
+                df["part_of_speech"] = df["part_of_speech"].map(get_pos_display)
+                df.columns = ["ID", "虚词", "词性", "用法", "翻译"]
+
+                event = st.dataframe(
+                    df,
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key="actions_table",
+                )
 
-        st.markdown(f"### 共 {len(actions)} 个虚词用法")
+                selected_rows = event.selection.rows
+                if selected_rows:
+                    action = actions[selected_rows[0]]
 
-        # 显示表格
-        for action in actions:
-            pos_display = get_pos_display(action["part_of_speech"])
-            with st.expander(
-                f"{action['empty_word']} - {action['action']} ({pos_display})"
-            ):
-                col1, col2, col3 = st.columns([3, 1, 1])
-
-                with col1:
-                    st.markdown(f"**虚词**: {action['empty_word']}")
-                    st.markdown(f"**词性**: {pos_display}")
-                    st.markdown(f"**用法**: {action['action']}")
-                    st.markdown(f"**翻译**: {action['translation']}")
-
-                with col2:
-                    pass
-
-                with col3:
                     if st.button("删除", key=f"delete_{action['id']}"):
                         db.delete_empty_word_action(action["id"])
+                        _bump_data_ver()
                         st.success("已删除")
-                        st.rerun()
-
-                # 内联编辑
-                st.markdown("**修改**:")
-                with st.form(key=f"edit_form_{action['id']}"):
-                    col_empty, col_pos = st.columns(2)
-                    with col_empty:
-                        edit_empty_word = st.selectbox(
-                            "虚词",
-                            EMPTY_WORDS,
-                            index=EMPTY_WORDS.index(action["empty_word"]),
-                            key=f"ew_{action['id']}",
-                        )
-                    with col_pos:
-                        # 显示中文，但存储英文
-                        pos_options_zh = [
-                            get_pos_display(pos) for pos in PART_OF_SPEECH
-                        ]
-                        selected_zh = get_pos_display(action["part_of_speech"])
-                        edit_part_of_speech_zh = st.selectbox(
-                            "词性",
-                            pos_options_zh,
-                            index=pos_options_zh.index(selected_zh)
-                            if selected_zh in pos_options_zh
-                            else 0,
-                            key=f"pos_{action['id']}",
+                        st.rerun(scope="fragment")
+
+                    # 内联编辑
+                    st.markdown("**修改**:")
+                    with st.form(key=f"edit_form_{action['id']}"):
+                        col_empty, col_pos = st.columns(2)
+                        with col_empty:
+                            edit_empty_word = st.selectbox(
+                                "虚词",
+                                EMPTY_WORDS,
+                                index=EMPTY_WORDS.index(action["empty_word"]),
+                                key=f"ew_{action['id']}",
+                            )
+                        with col_pos:
+                            # 显示中文，但存储英文
+                            selected_zh = get_pos_display(action["part_of_speech"])
+                            edit_part_of_speech_zh = st.selectbox(
+                                "词性",
+                                POS_OPTIONS_ZH,
+                                index=POS_OPTIONS_ZH_INDEX.get(selected_zh, 0),
+                                key=f"pos_{action['id']}",
+                            )
+                            edit_part_of_speech = PART_OF_SPEECH_EN[
+                                edit_part_of_speech_zh
+                            ]
+                        edit_action = st.text_input(
+                            "用法", action["action"], key=f"act_{action['id']}"
                         )
-                        edit_part_of_speech = PART_OF_SPEECH_EN[edit_part_of_speech_zh]
-                    edit_action = st.text_input(
-                        "用法", action["action"], key=f"act_{action['id']}"
-                    )
-                    edit_translation = st.text_input(
-                        "翻译", action["translation"], key=f"trans_{action['id']}"
-                    )
-                    if st.form_submit_button("更新"):
-                        db.update_empty_word_action(
-                            action["id"],
-                            edit_empty_word,
-                            edit_part_of_speech,
-                            edit_action,
-                            edit_translation,
+                        edit_translation = st.text_input(
+                            "翻译", action["translation"], key=f"trans_{action['id']}"
                         )
-                        st.success("已更新")
-                        st.rerun()
+                        if st.form_submit_button("更新"):
+                            db.update_empty_word_action(
+                                action["id"],
+                                edit_empty_word,
+                                edit_part_of_speech,
+                                edit_action,
+                                edit_translation,
+                            )
+                            _bump_data_ver()
+                            st.success("已更新")
+                            st.rerun(scope="fragment")
+
+        actions_list_fragment(filter_empty_word)
 
     with tab2:
         st.markdown("### 添加新虚词用法")
@@ -185,8 +379,7 @@ if page == "数据管理":
         col1, col2 = st.columns(2)
         with col1:
             new_empty_word = st.selectbox("虚词", EMPTY_WORDS)
-            pos_options_zh = [get_pos_display(pos) for pos in PART_OF_SPEECH]
-            new_part_of_speech_zh = st.selectbox("词性", pos_options_zh)
+            new_part_of_speech_zh = st.selectbox("词性", POS_OPTIONS_ZH)
             new_part_of_speech = PART_OF_SPEECH_EN[new_part_of_speech_zh]
         with col2:
             new_action = st.text_input("用法")
@@ -197,6 +390,7 @@ if page == "数据管理":
                 action_id = db.create_empty_word_action(
                     new_empty_word, new_part_of_speech, new_action, new_translation
                 )
+                _bump_data_ver()
                 st.success(f"添加成功，ID: {action_id}")
                 st.rerun()
             else:
@@ -220,24 +414,60 @@ elif page == "例句管理":
                 filter_empty_word = None
                 st.rerun()
 
-        sentences = db.get_all_example_sentences(filter_empty_word)
-        st.markdown(f"### 共 {len(sentences)} 个例句")
+        # 列表 + 删除放进 fragment：删除只重跑本片段，不重跑整页
+        @st.fragment
+        def sentences_list_fragment(filter_empty_word):
+            # 服务端分页，只取当前页
+            total_sentences = _cached_example_sentence_count(
+                filter_empty_word, _data_ver()
+            )
+            st.markdown(f"### 共 {total_sentences} 个例句")
 
-        for sentence in sentences:
-            with st.expander(f"{sentence['sentence'][:50]}..."):
-                st.markdown(f"**例句**: {sentence['sentence']}")
-                st.markdown(f"**虚词**: {sentence['empty_word']}")
-                if sentence["actions"]:
-                    st.markdown(f"**用法**: {', '.join(sentence['actions'])}")
-                if sentence["tags"]:
-                    st.markdown(f"**标签**: {sentence['tags']}")
-
-                col1, col2 = st.columns([3, 1])
-                with col1:
+            max_page = max(1, (total_sentences + PAGE_SIZE - 1) // PAGE_SIZE)
+            page_no = st.number_input(
+                "页码", min_value=1, max_value=max_page, value=1, key="sentences_page"
+            )
+            sentences = _cached_example_sentences(
+                filter_empty_word,
+                _data_ver(),
+                limit=PAGE_SIZE,
+                offset=(page_no - 1) * PAGE_SIZE,
+            )
+
+            # 单个表格组件渲染全部例句，选中某行后再提供删除
+            if sentences:
+                df = pd.DataFrame(
+                    [
+                        {
+                            "ID": s["id"],
+                            "例句": s["sentence"],
+                            "虚词": s["empty_word"],
+                            "用法": ", ".join(s["actions"]) if s["actions"] else "",
+                            "标签": s["tags"] or "",
+                        }
+                        for s in sentences
+                    ]
+                )
+
+                event = st.dataframe(
+                    df,
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select="rerun",
+                    selection_mode="single-row",
+                    key="sentences_table",
+                )
+
+                selected_rows = event.selection.rows
+                if selected_rows:
+                    sentence = sentences[selected_rows[0]]
                     if st.button("删除", key=f"del_s_{sentence['id']}"):
                         db.delete_example_sentence(sentence["id"])
+                        _bump_data_ver()
                         st.success("已删除")
-                        st.rerun()
+                        st.rerun(scope="fragment")
+
+        sentences_list_fragment(filter_empty_word)
 
     with tab2:
         st.markdown("### 批量添加例句")
@@ -253,35 +483,40 @@ elif page == "例句管理":
                 lines = [
                     line.strip() for line in sentence_input.split("\n") if line.strip()
                 ]
-                added_count = 0
-
                 progress_bar = st.progress(0)
                 status_text = st.empty()
 
+                # 预加载所有虚词的用法，避免每行每个虚词都查一次库
+                actions_by_word = {
+                    w: db.get_all_empty_word_actions(w) for w in EMPTY_WORDS
+                }
+
+                # 先做识别，收集所有待插入的行，数据库只走一个事务
+                tags = [f"batch_{datetime.now().strftime('%Y%m%d')}"]
+                rows = []
+                detected = db.detect_empty_words_bulk(lines)
                 for i, line in enumerate(lines):
-                    # 检测虚词
-                    empty_words = db.detect_empty_words_in_sentence(line)
-
-                    if empty_words:
-                        # 为每个虚词查找可用的用法
-                        for empty_word in empty_words:
-                            actions = db.get_all_empty_word_actions(empty_word)
-                            if actions:
-                                # 默认选择第一个用法
-                                action_id = actions[0]["id"]
-                                tags = [f"batch_{datetime.now().strftime('%Y%m%d')}"]
+                    empty_words = detected[i]
 
-                                try:
-                                    db.create_example_sentence(
-                                        line, tags, empty_word, [action_id]
-                                    )
-                                    added_count += 1
-                                except Exception as e:
-                                    st.warning(f"添加失败: {line} - {str(e)}")
+                    # 为每个虚词查找可用的用法
+                    for empty_word in empty_words:
+                        actions = actions_by_word.get(empty_word, [])
+                        if actions:
+                            # 默认选择第一个用法
+                            action_id = actions[0]["id"]
+                            rows.append((line, tags, empty_word, [action_id]))
 
                     progress_bar.progress((i + 1) / len(lines))
                     status_text.text(f"处理中: {i + 1}/{len(lines)}")
 
+                added_count = 0
+                if rows:
+                    try:
+                        added_count = db.create_example_sentences_bulk(rows)
+                        _bump_data_ver()
+                    except Exception as e:
+                        st.warning(f"批量添加失败: {str(e)}")
+
                 progress_bar.empty()
                 status_text.empty()
 
@@ -299,7 +534,7 @@ elif page == "例句管理":
             )
         with col2:
             manual_empty_word = st.selectbox("虚词", EMPTY_WORDS)
-            manual_actions = db.get_all_empty_word_actions(manual_empty_word)
+            manual_actions = _cached_actions(manual_empty_word, _data_ver())
 
             if manual_actions:
                 manual_action_ids = st.multiselect(
@@ -321,6 +556,7 @@ elif page == "例句管理":
                 db.create_example_sentence(
                     manual_sentence, tags, manual_empty_word, action_ids
                 )
+                _bump_data_ver()
                 st.success("添加成功")
                 st.rerun()
             else:
@@ -348,13 +584,12 @@ elif page == "试卷生成":
         else:
             filter_empty_words = filter_empty_words_selected
 
-        # 获取所有可能的词性
+        # 获取所有可能的词性（没选虚词时不查库）
         all_pos = set()
         if filter_empty_words:
-            actions = db.get_all_empty_word_actions()
-            for action in actions:
-                if action["empty_word"] in filter_empty_words:
-                    all_pos.add(action["part_of_speech"])
+            all_pos = set(
+                _cached_pos_for_words(tuple(filter_empty_words), _data_ver())
+            )
 
         # 显示中文词性供选择（默认全选）
         pos_display_options = ["全选"] + sorted(
@@ -367,16 +602,8 @@ elif page == "试卷生成":
 
         # 处理词性全选逻辑
         if "全选" in filter_pos_zh and filter_pos_zh:
-            # 选择了全选，获取所有不包含"全选"的词性
-            pos_display_options_filtered = [
-                p for p in pos_display_options if p != "全选"
-            ]
-            # 只转换真实词性，排除"全选"
-            filter_pos = [
-                PART_OF_SPEECH_EN[pos_zh]
-                for pos_zh in pos_display_options_filtered
-                if pos_zh != "全选" and pos_zh in PART_OF_SPEECH_EN
-            ]
+            # 选择了全选：取预计算的词性表中当前虚词实际存在的那些
+            filter_pos = [p for p in ALL_POS_EN_SORTED if p in all_pos]
         else:
             # 转换为英文用于查询，排除"全选"
             filter_pos = (
@@ -403,41 +630,19 @@ elif page == "试卷生成":
     if generate_and_export_button:
         # 直接导出 Word 的逻辑
         if question_count > 0:
-            # 获取符合条件的例句
-            sentences = db.get_all_example_sentences()
-
-            # 过滤例句
-            filtered_sentences = []
-            for sentence in sentences:
-                if (
-                    filter_empty_words
-                    and sentence["empty_word"] not in filter_empty_words
-                ):
-                    continue
-
-                # 检查词性
-                if filter_pos:
-                    sentence_actions = db.get_all_empty_word_actions(
-                        sentence["empty_word"]
-                    )
-                    if not any(
-                        action["part_of_speech"] in filter_pos
-                        for action in sentence_actions
-                    ):
-                        continue
-
-                filtered_sentences.append(sentence)
+            # 过滤和随机抽样都交给 SQL，只取 question_count 条回来
+            selected_sentences = db.sample_sentences(
+                filter_empty_words, filter_pos, question_count
+            )
 
-            if len(filtered_sentences) == 0:
+            if len(selected_sentences) == 0:
                 st.error("没有符合条件的例句")
             else:
-                # 随机打乱例句顺序（不按数据库顺序）
-                random.shuffle(filtered_sentences)
-
-                # 随机选择例句
-                selected_sentences = random.sample(
-                    filtered_sentences, min(question_count, len(filtered_sentences))
-                )
+                # 每个虚词的用法只查一次，循环内直接复用
+                distinct_words = {s["empty_word"] for s in selected_sentences}
+                actions_cache = {
+                    w: db.get_all_empty_word_actions(w) for w in distinct_words
+                }
 
                 # 为每个句子生成题目（包含选项）
                 questions = []
@@ -451,23 +656,29 @@ elif page == "试卷生成":
 
                     if correct_action_id:
                         # 获取3个干扰项（同一个虚词的其他用法）
-                        all_actions = db.get_all_empty_word_actions(
-                            sentence["empty_word"]
-                        )
-                        wrong_actions = [
-                            a for a in all_actions if a["id"] != correct_action_id
-                        ]
-                        options = random.sample(
-                            wrong_actions, min(3, len(wrong_actions))
+                        # 直接抽下标，不为每题复制一份去掉正确答案的列表
+                        all_actions = actions_cache[sentence["empty_word"]]
+                        n = len(all_actions)
+                        correct_idx = next(
+                            (
+                                k
+                                for k, a in enumerate(all_actions)
+                                if a["id"] == correct_action_id
+                            ),
+                            None,
                         )
 
+                        wrong_total = n - 1 if correct_idx is not None else n
+                        idxs = set()
+                        while len(idxs) < min(3, wrong_total):
+                            k = random.randrange(n)
+                            if k != correct_idx:
+                                idxs.add(k)
+                        options = [all_actions[k] for k in idxs]
+
                         # 添加正确答案
-                        correct_option = next(
-                            (a for a in all_actions if a["id"] == correct_action_id),
-                            None,
-                        )
-                        if correct_option:
-                            options.append(correct_option)
+                        if correct_idx is not None:
+                            options.append(all_actions[correct_idx])
                             random.shuffle(options)
 
                         questions.append(
@@ -522,7 +733,7 @@ elif page == "试卷生成":
                         action = db.get_empty_word_action(action_id)
                         if action:
                             action_text = action["action"]
-                            translation = action.get("translation", "")
+                            translation = action["translation"] or ""
                             if translation:
                                 option_text = (
                                     f"{chr(96 + j)}. {action_text}（{translation}）"
@@ -563,25 +774,43 @@ else:  # 试卷列表
     if not papers:
         st.info("还没有试卷")
     else:
-        for paper in papers:
-            with st.expander(f"{paper['title']} - {paper['created_at']}"):
-                col1, col2, col3 = st.columns([3, 1, 1])
-
-                with col1:
-                    st.markdown(f"**标题**: {paper['title']}")
-                    st.markdown(f"**题目数**: {paper['question_count']}")
-                    st.markdown(f"**创建时间**: {paper['created_at']}")
-
-                with col2:
-                    if st.button("查看详情", key=f"view_{paper['id']}"):
-                        st.session_state[f"view_paper_id"] = paper["id"]
-                        st.rerun()
-
-                with col3:
-                    if st.button("删除", key=f"del_p_{paper['id']}"):
-                        db.delete_paper(paper["id"])
-                        st.success("已删除")
-                        st.rerun()
+        # 单个表格组件渲染全部试卷，选中某行后再提供操作
+        df = pd.DataFrame(
+            [
+                {
+                    "ID": p["id"],
+                    "标题": p["title"],
+                    "题目数": p["question_count"],
+                    "创建时间": p["created_at"],
+                }
+                for p in papers
+            ]
+        )
+
+        event = st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key="papers_table",
+        )
+
+        selected_rows = event.selection.rows
+        if selected_rows:
+            paper = papers[selected_rows[0]]
+            col1, col2 = st.columns(2)
+
+            with col1:
+                if st.button("查看详情", key=f"view_{paper['id']}"):
+                    st.session_state[f"view_paper_id"] = paper["id"]
+                    st.rerun()
+
+            with col2:
+                if st.button("删除", key=f"del_p_{paper['id']}"):
+                    db.delete_paper(paper["id"])
+                    st.success("已删除")
+                    st.rerun()
 
         # 查看试卷详情
         if f"view_paper_id" in st.session_state:
@@ -608,100 +837,32 @@ else:  # 试卷列表
             doc_ready_key = f"doc_ready_{paper_id}"
 
             if st.button("导出为 Word", key=f"export_btn_{paper_id}"):
-                # 生成文档
-                doc = Document()
-
-                # 标题
-                title = doc.add_heading(paper["title"], 0)
-                title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-                # 添加空行
-                doc.add_paragraph()
-
-                # 题目
-                for i, question_data in enumerate(paper["questions"], 1):
-                    # 获取句子
-                    sentence = question_data.get("sentence", "")
-                    action_id = question_data.get("action_id")
-
-                    # 题号
-                    para = doc.add_paragraph(f"{i}. ", style="Normal")
-
-                    # 高亮虚词
-                    if highlight_word and sentence:
-                        # 找到虚词
-                        empty_word = None
-                        for word in EMPTY_WORDS:
-                            if word in sentence:
-                                empty_word = word
-                                break
-
-                        if empty_word:
-                            # 找到虚词在句子中的位置
-                            parts = sentence.split(empty_word, 1)
-                            if parts[0]:
-                                para.add_run(parts[0])
-                            run = para.add_run(empty_word)
-                            run.bold = True
-                            if len(parts) > 1 and parts[1]:
-                                para.add_run(parts[1])
-                        else:
-                            para.add_run(sentence)
-                    else:
-                        if sentence:
-                            para.add_run(sentence)
-
-                    # 选项
-                    if show_options and question_data.get("options"):
-                        options = question_data["options"]
-                        for j, option in enumerate(options, 1):
-                            # 构建选项文本：作用 + 意思
-                            action = option.get("action", "")
-                            translation = option.get("translation", "")
-                            if translation:
-                                option_text = (
-                                    f"{chr(96 + j)}. {action}（{translation}）"
-                                )
-                            else:
-                                option_text = f"{chr(96 + j)}. {action}"
-                            para = doc.add_paragraph(option_text)
-                            para.paragraph_format.left_indent = Inches(0.5)
-
-                    # 答案
-                    if show_answer:
-                        options = question_data.get("options", [])
-                        correct_answer = next(
-                            (opt for opt in options if opt.get("is_correct")), None
-                        )
-                        if correct_answer:
-                            action = correct_answer.get("action", "")
-                            translation = correct_answer.get("translation", "")
-                            if translation:
-                                answer_text = f"答案: {action}（{translation}）"
-                            else:
-                                answer_text = f"答案: {action}"
-                            para = doc.add_paragraph(answer_text)
-                            para.paragraph_format.left_indent = Inches(0.5)
-
-                    # 只有在有选项或答案时才添加空行（默认导出版面更紧凑）
-                    if show_options and question_data.get("options"):
-                        doc.add_paragraph()  # 空行
-                    elif show_answer:
-                        doc.add_paragraph()  # 空行
-
-                # 保存到内存
-                filename = f"{paper['title']}.docx"
-                doc_io = io.BytesIO()
-                doc.save(doc_io)
-                doc_bytes = doc_io.getvalue()
-
-                # 存储到 session_state
-                st.session_state[f"doc_bytes_{paper_id}"] = doc_bytes
-                st.session_state[f"doc_filename_{paper_id}"] = filename
+                # 提交到后台线程池生成，不阻塞脚本线程；命中缓存时立即返回
+                fut = get_executor().submit(
+                    build_docx_bytes,
+                    paper_id,
+                    show_options,
+                    show_answer,
+                    highlight_word,
+                    _data_ver(),
+                )
+                st.session_state[f"doc_future_{paper_id}"] = fut
+                st.session_state[doc_ready_key] = False
+
+            # 轮询后台任务状态
+            fut = st.session_state.get(f"doc_future_{paper_id}")
+            if fut is not None:
+                if not fut.done():
+                    with st.spinner("试卷生成中..."):
+                        fut.result()
+
+                st.session_state[f"doc_bytes_{paper_id}"] = fut.result()
+                st.session_state[f"doc_filename_{paper_id}"] = (
+                    f"{paper['title']}.docx"
+                )
                 st.session_state[doc_ready_key] = True
-
+                del st.session_state[f"doc_future_{paper_id}"]
                 st.success("试卷已生成！")
-                st.rerun()
 
             # 如果文档已生成，显示下载按钮
             if st.session_state.get(doc_ready_key, False):
@@ -774,6 +935,7 @@ if page == "句子管理":
                         else []
                     )
                     db.create_sentence(new_sentence, nos_list, tags_list)
+                    _bump_data_ver()
                     st.success("添加成功")
                     st.rerun()
                 else:
@@ -785,11 +947,11 @@ if page == "句子管理":
         # 收集所有符合任一虚词的句子
         all_sentences = {}
         for word in filter_empty_words:
-            for sentence in db.get_all_sentences(word):
+            for sentence in _cached_sentences(word, _data_ver()):
                 all_sentences[sentence["id"]] = sentence
         sentences = list(all_sentences.values())
     else:
-        sentences = db.get_all_sentences()
+        sentences = _cached_sentences(None, _data_ver())
 
     st.markdown(f"### 共 {len(sentences)} 个句子")
 
@@ -851,8 +1013,6 @@ if page == "句子管理":
 
     if len(sentences) > 0:
         # 准备表格数据
-        import pandas as pd
-
         table_data = []
         for sentence in sentences:
             table_data.append(
@@ -903,6 +1063,7 @@ if page == "句子管理":
                                     deleted_count += 1
                                 except Exception:
                                     pass
+                            _bump_data_ver()
                             st.success(f"已删除 {deleted_count} 个句子")
                             st.rerun()
                         except Exception:
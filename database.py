@@ -2,123 +2,394 @@
 # -*- coding: utf-8 -*-
 
 import json
+import re
 import sqlite3
+import threading
+from collections import defaultdict
 from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional
 
+# 18 个常见文言虚词（全部为单字，顺序与教师端展示一致）
+_EMPTY_WORDS = "而何乎乃其且若所为焉也以因于与则者之"
+_EMPTY_WORDS_SET = frozenset(_EMPTY_WORDS)
+
+# "所有句子.md" 的行格式：序号. 句子内容
+_LINE_RE = re.compile(r"^(\d+)\.\s+(.+)$")
+
+# 当前建表语句对应的库结构版本，写进 PRAGMA user_version；
+# 结构变更时 +1，让老库重新走一遍 DDL
+# 版本 2：question/question_option 对例句和用法的外键补上级联删除
+_SCHEMA_VERSION = 2
+
+# 按连接生效的 PRAGMA（journal_mode 持久化在文件头里，不在此列）
+_CONNECTION_PRAGMAS = """
+    PRAGMA foreign_keys=ON;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=536870912;
+    PRAGMA busy_timeout=5000;
+"""
+
+# 复用率最高的写入语句提升为模块级常量：同一 str 对象反复命中
+# sqlite3 的语句缓存，省去每次调用重建字符串和重新 prepare
+_SQL_INSERT_EXAMPLE_SENTENCE = """
+    INSERT INTO example_sentence (sentence, tags, empty_word)
+    VALUES (?, ?, ?)
+"""
+_SQL_INSERT_SENTENCE_ACTION = """
+    INSERT INTO sentence_action (sentence_id, action_id)
+    VALUES (?, ?)
+"""
+
 
 class Database:
     def __init__(self, db_path="虚词大战.db"):
         self.db_path = db_path
         self.init_db()
 
+        # 长连接：省掉每次 CRUD 的 connect/close（每次 open 都要重读
+        # sqlite_master 并丢掉页缓存），配合锁保证线程安全
+        self._lock = threading.Lock()
+        # isolation_level=None：关掉 sqlite3 模块的隐式事务启发式，
+        # 事务边界全部由 transaction() 显式控制
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=256,
+            isolation_level=None,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_CONNECTION_PRAGMAS)
+
+        # 用法表几乎只读，按查询参数缓存结果；写操作时整体失效
+        # （不用 lru_cache：绑定方法会把 self 挂进全局缓存）
+        # 每个会话线程各持一个实例，跨实例的写入靠 data_version
+        # 兜底：命中前核对一次，别的连接提交过就整体作废
+        self._ewa_cache: Dict[tuple, List[Dict]] = {}
+        self._ewa_cache_version: Optional[int] = None
+
     def init_db(self):
         """初始化数据库"""
-        conn = sqlite3.connect(self.db_path)
+        # isolation_level=None：建表、迁移和版本号打在同一个显式
+        # 事务里，半成品结构不会带着新版本号落盘
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
         cursor = conn.cursor()
 
-        # EmptyWordAction 表
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS empty_word_action (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                empty_word TEXT NOT NULL,
-                part_of_speech TEXT NOT NULL,
-                action TEXT NOT NULL,
-                translation TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Sentence 表（句子基础表）
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sentence (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sentence TEXT NOT NULL UNIQUE,
-                nos TEXT NOT NULL,
-                tags TEXT
-            )
-        """)
-
-        # ExampleSentence 表
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS example_sentence (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sentence_id INTEGER NOT NULL,
-                empty_word TEXT NOT NULL,
-                action_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (sentence_id) REFERENCES sentence(id),
-                FOREIGN KEY (action_id) REFERENCES empty_word_action(id)
-            )
-        """)
-
-        # Sentence_Action 关联表（一个句子可以有多个虚词用法）
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sentence_action (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sentence_id INTEGER NOT NULL,
-                action_id INTEGER NOT NULL,
-                FOREIGN KEY (sentence_id) REFERENCES example_sentence(id),
-                FOREIGN KEY (action_id) REFERENCES empty_word_action(id),
-                UNIQUE(sentence_id, action_id)
-            )
-        """)
-
-        # Paper 表
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS paper (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                question_count INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        # Question 表
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS question (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                paper_id INTEGER NOT NULL,
-                sentence_id INTEGER NOT NULL,
-                action_id INTEGER NOT NULL,
-                question_order INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (paper_id) REFERENCES paper(id),
-                FOREIGN KEY (sentence_id) REFERENCES example_sentence(id),
-                FOREIGN KEY (action_id) REFERENCES empty_word_action(id)
-            )
-        """)
-
-        # Option 表（每个题目有多个选项）
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS question_option (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                question_id INTEGER NOT NULL,
-                action_id INTEGER NOT NULL,
-                is_correct BOOLEAN DEFAULT 0,
-                option_order INTEGER NOT NULL,
-                FOREIGN KEY (question_id) REFERENCES question(id),
-                FOREIGN KEY (action_id) REFERENCES empty_word_action(id)
+        try:
+            # 结构版本已是最新就不再跑建表/建索引 DDL
+            if cursor.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+                return
+
+            # WAL + 放宽同步：把每次提交的 fsync 开销降到接近于零
+            # journal_mode 持久化在文件头里，只需设一次
+            # （内存库没有文件头，设 WAL 无意义）
+            if self.db_path != ":memory:":
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.executescript("""
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-65536;
+                PRAGMA mmap_size=536870912;
+                PRAGMA busy_timeout=5000;
+            """)
+
+            # 中途失败则事务不提交，版本号保持 0，下次启动重跑；
+            # 只有下面整套 DDL + 迁移都成功才会打上 _SCHEMA_VERSION
+            cursor.execute("BEGIN IMMEDIATE")
+
+            # EmptyWordAction 表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS empty_word_action (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    empty_word TEXT NOT NULL,
+                    part_of_speech TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    translation TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Sentence 表（句子基础表）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sentence (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sentence TEXT NOT NULL UNIQUE
+                )
+            """)
+
+            # 序号/标签子表：代替父表上的 CSV 列，读取免 split，
+            # 且可以按单个序号/标签走索引查询
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sentence_no (
+                    sentence_id INTEGER NOT NULL,
+                    no INTEGER NOT NULL,
+                    PRIMARY KEY (sentence_id, no),
+                    FOREIGN KEY (sentence_id) REFERENCES sentence(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sentence_tag (
+                    sentence_id INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (sentence_id, tag),
+                    FOREIGN KEY (sentence_id) REFERENCES sentence(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
+            """)
+
+            # ExampleSentence 表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS example_sentence (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sentence_id INTEGER,
+                    sentence TEXT,
+                    tags TEXT,
+                    empty_word TEXT NOT NULL,
+                    action_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (sentence_id) REFERENCES sentence(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id)
+                )
+            """)
+
+            # Sentence_Action 关联表（一个句子可以有多个虚词用法）
+            # 纯多对多关联：复合主键 + WITHOUT ROWID，一棵 btree 存完，
+            # 省掉隐式 rowid 树和独立的 UNIQUE 索引
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sentence_action (
+                    sentence_id INTEGER NOT NULL,
+                    action_id INTEGER NOT NULL,
+                    PRIMARY KEY (sentence_id, action_id),
+                    FOREIGN KEY (sentence_id) REFERENCES example_sentence(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
+            """)
+
+            # Paper 表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS paper (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    question_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Question 表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS question (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    paper_id INTEGER NOT NULL,
+                    sentence_id INTEGER NOT NULL,
+                    action_id INTEGER NOT NULL,
+                    question_order INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (paper_id) REFERENCES paper(id) ON DELETE CASCADE,
+                    FOREIGN KEY (sentence_id) REFERENCES example_sentence(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id) ON DELETE CASCADE
+                )
+            """)
+
+            # Option 表（每个题目有多个选项）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS question_option (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    question_id INTEGER NOT NULL,
+                    action_id INTEGER NOT NULL,
+                    is_correct BOOLEAN DEFAULT 0,
+                    option_order INTEGER NOT NULL,
+                    FOREIGN KEY (question_id) REFERENCES question(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id) ON DELETE CASCADE
+                )
+            """)
+
+            # 旧版库升级：user_version 还是 0 时走到这里，
+            # 老结构的残留在建表 DDL 之后、建索引之前原地改掉
+            self._migrate_legacy_sentence_columns(cursor)
+            self._migrate_legacy_cascades(cursor)
+
+            # 外键和筛选列上的索引：把热查询的全表扫描变成索引查找
+            # （executescript 会隐式提交，这里逐条执行留在事务里）
+            for index_sql in (
+                "CREATE INDEX IF NOT EXISTS idx_sa_action ON sentence_action(action_id)",
+                "CREATE INDEX IF NOT EXISTS idx_sn_no ON sentence_no(no)",
+                "CREATE INDEX IF NOT EXISTS idx_q_paper ON question(paper_id)",
+                "CREATE INDEX IF NOT EXISTS idx_qo_question ON question_option(question_id)",
+                "CREATE INDEX IF NOT EXISTS idx_qo_action ON question_option(action_id)",
+                "CREATE INDEX IF NOT EXISTS idx_es_word ON example_sentence(empty_word)",
+                "CREATE INDEX IF NOT EXISTS idx_ewa_word ON empty_word_action(empty_word)",
+                "ANALYZE",
+            ):
+                cursor.execute(index_sql)
+
+            cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            cursor.execute("COMMIT")
+        finally:
+            # 失败时未提交的事务随连接关闭一起回滚，不留写锁
+            conn.close()
+
+    @staticmethod
+    def _migrate_legacy_sentence_columns(cursor):
+        """把 sentence 表上的旧 nos/tags CSV 列拆进子表
+
+        旧结构把序号和标签存成父表上的逗号分隔字符串；存在旧列时
+        把 CSV 拆行复制进 sentence_no/sentence_tag，再删掉旧列，
+        让老库文件和新建库结构一致。
+        """
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(sentence)")}
+        if "nos" not in columns:
+            return
+
+        no_rows = []
+        tag_rows = []
+        for sid, nos, tags in cursor.execute(
+            "SELECT id, nos, tags FROM sentence"
+        ).fetchall():
+            if nos:
+                no_rows.extend((sid, int(n)) for n in nos.split(",") if n)
+            if tags:
+                tag_rows.extend((sid, tag) for tag in tags.split(",") if tag)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO sentence_no (sentence_id, no) VALUES (?, ?)",
+            no_rows,
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO sentence_tag (sentence_id, tag) VALUES (?, ?)",
+            tag_rows,
+        )
+        cursor.execute("ALTER TABLE sentence DROP COLUMN nos")
+        cursor.execute("ALTER TABLE sentence DROP COLUMN tags")
+
+    @staticmethod
+    def _migrate_legacy_cascades(cursor):
+        """把级联删除子句不全的旧关联表重建成新结构
+
+        旧外键没有级联删除子句（sentence_action 还带多余的代理主键），
+        删父行时子表会抛 IntegrityError。SQLite 改不了已有外键，
+        只能按新 DDL 建影子表、搬共有列、丢旧表再改名；本连接外键
+        检查未开启，改名放在最后做，其他表的引用不会被改写。
+        """
+        rebuilds = [
+            (
+                "example_sentence",
+                """
+                CREATE TABLE example_sentence_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sentence_id INTEGER,
+                    sentence TEXT,
+                    tags TEXT,
+                    empty_word TEXT NOT NULL,
+                    action_id INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (sentence_id) REFERENCES sentence(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id)
+                )
+                """,
+            ),
+            (
+                "sentence_action",
+                """
+                CREATE TABLE sentence_action_new (
+                    sentence_id INTEGER NOT NULL,
+                    action_id INTEGER NOT NULL,
+                    PRIMARY KEY (sentence_id, action_id),
+                    FOREIGN KEY (sentence_id) REFERENCES example_sentence(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
+                """,
+            ),
+            (
+                "question",
+                """
+                CREATE TABLE question_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    paper_id INTEGER NOT NULL,
+                    sentence_id INTEGER NOT NULL,
+                    action_id INTEGER NOT NULL,
+                    question_order INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (paper_id) REFERENCES paper(id) ON DELETE CASCADE,
+                    FOREIGN KEY (sentence_id) REFERENCES example_sentence(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id) ON DELETE CASCADE
+                )
+                """,
+            ),
+            (
+                "question_option",
+                """
+                CREATE TABLE question_option_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    question_id INTEGER NOT NULL,
+                    action_id INTEGER NOT NULL,
+                    is_correct BOOLEAN DEFAULT 0,
+                    option_order INTEGER NOT NULL,
+                    FOREIGN KEY (question_id) REFERENCES question(id) ON DELETE CASCADE,
+                    FOREIGN KEY (action_id) REFERENCES empty_word_action(id) ON DELETE CASCADE
+                )
+                """,
+            ),
+        ]
+        for table, shadow_ddl in rebuilds:
+            row = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            ).fetchone()
+            # 按级联子句数量判断是否需要重建：老版本升级过的表可能
+            # 只带部分级联（版本 1 的 question 只有 paper_id 一条）
+            if row is None or row[0].count("ON DELETE CASCADE") >= shadow_ddl.count(
+                "ON DELETE CASCADE"
+            ):
+                continue
+            old_cols = [r[1] for r in cursor.execute(f"PRAGMA table_info({table})")]
+            cursor.execute(shadow_ddl)
+            new_cols = {
+                r[1] for r in cursor.execute(f"PRAGMA table_info({table}_new)")
+            }
+            shared = ", ".join(col for col in old_cols if col in new_cols)
+            cursor.execute(
+                f"INSERT INTO {table}_new ({shared}) SELECT {shared} FROM {table}"
             )
-        """)
+            cursor.execute(f"DROP TABLE {table}")
+            cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
 
-        conn.commit()
-        conn.close()
+    def close(self):
+        """关闭长连接（先跑 PRAGMA optimize 让查询规划统计落盘）"""
+        with self._lock:
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self, mode: str = "DEFERRED"):
+        """显式事务（BEGIN {mode} … COMMIT/ROLLBACK）
+
+        mode 可选 DEFERRED/IMMEDIATE/EXCLUSIVE；IMMEDIATE 直接拿
+        写锁，避免写升级时的 SQLITE_BUSY。
+        """
+        with self._lock:
+            self._conn.execute(f"BEGIN {mode}")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
 
     @contextmanager
     def get_connection(self):
-        """获取数据库连接（上下文管理器）"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        """获取数据库连接（上下文管理器，复用长连接，单事务提交）"""
+        with self.transaction() as conn:
             yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+
+    @contextmanager
+    def bulk(self):
+        """批量写入上下文（BEGIN IMMEDIATE，一次提交多条写入）
+
+        直接拿写锁开事务，调用方循环写入也只付一次 fsync；
+        与 get_connection 相比省去每次调用各自提交的开销。
+        """
+        with self.transaction("IMMEDIATE") as conn:
+            yield conn.cursor()
 
     # EmptyWordAction CRUD
     def create_empty_word_action(
@@ -134,30 +405,86 @@ class Database:
             """,
                 (empty_word, part_of_speech, action, translation),
             )
+            self._ewa_cache.clear()
             return cursor.lastrowid
 
-    def get_all_empty_word_actions(self, empty_word: Optional[str] = None):
-        """获取所有虚词用法"""
+    def get_all_empty_word_actions(
+        self,
+        empty_word: Optional[str] = None,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ):
+        """获取所有虚词用法（limit/offset 用于分页，结果带缓存）"""
+        cache_key = (empty_word, limit, offset)
+
+        # data_version 在别的连接提交写入后变化（读文件头，不触表）；
+        # 本实例的写操作已直接清缓存，这里专防其他会话实例的写入
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._ewa_cache_version:
+            self._ewa_cache.clear()
+            self._ewa_cache_version = data_version
+
+        cached = self._ewa_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             if empty_word:
+                query = "SELECT * FROM empty_word_action WHERE empty_word = ? ORDER BY id"
+                params = [empty_word]
+            else:
+                query = "SELECT * FROM empty_word_action ORDER BY empty_word, id"
+                params = []
+
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
+
+            cursor.execute(query, tuple(params))
+            result = [dict(row) for row in cursor]
+            self._ewa_cache[cache_key] = result
+            return result
+
+    def get_distinct_parts_of_speech(self, empty_words: Optional[List[str]] = None):
+        """获取（指定虚词范围内的）所有不同词性"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if empty_words:
+                placeholders = ",".join("?" * len(empty_words))
                 cursor.execute(
-                    "SELECT * FROM empty_word_action WHERE empty_word = ?",
-                    (empty_word,),
+                    f"SELECT DISTINCT part_of_speech FROM empty_word_action "
+                    f"WHERE empty_word IN ({placeholders})",
+                    tuple(empty_words),
                 )
             else:
                 cursor.execute(
-                    "SELECT * FROM empty_word_action ORDER BY empty_word, id"
+                    "SELECT DISTINCT part_of_speech FROM empty_word_action"
                 )
-            return [dict(row) for row in cursor.fetchall()]
+            return [row[0] for row in cursor]
+
+    def count_empty_word_actions(self, empty_word: Optional[str] = None):
+        """统计虚词用法数量"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if empty_word:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM empty_word_action WHERE empty_word = ?",
+                    (empty_word,),
+                )
+            else:
+                cursor.execute("SELECT COUNT(*) FROM empty_word_action")
+            return cursor.fetchone()[0]
 
     def get_empty_word_action(self, action_id: int):
         """获取单个虚词用法"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM empty_word_action WHERE id = ?", (action_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            # sqlite3.Row 支持按列名取值，免去整行复制成 dict
+            return cursor.fetchone()
 
     def update_empty_word_action(
         self,
@@ -178,57 +505,87 @@ class Database:
             """,
                 (empty_word, part_of_speech, action, translation, action_id),
             )
+            self._ewa_cache.clear()
 
     def delete_empty_word_action(self, action_id: int):
         """删除虚词用法"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM empty_word_action WHERE id = ?", (action_id,))
+            self._ewa_cache.clear()
 
     # Sentence CRUD
     def create_sentence(self, sentence: str, nos: List[int], tags: List[str] = None):
         """创建句子"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            nos_str = ",".join(map(str, nos))
-            tags_str = ",".join(tags) if tags else ""
-
+            # upsert 保留原行和 rowid（OR REPLACE 是删了重插，
+            # 会级联删掉挂在句子上的例句），RETURNING 直接拿回 ID
             cursor.execute(
                 """
-                INSERT OR REPLACE INTO sentence (sentence, nos, tags)
-                VALUES (?, ?, ?)
+                INSERT INTO sentence (sentence)
+                VALUES (?)
+                ON CONFLICT(sentence) DO UPDATE SET sentence = excluded.sentence
+                RETURNING id
             """,
-                (sentence, nos_str, tags_str),
+                (sentence,),
             )
-            return cursor.lastrowid
+            sentence_id = cursor.fetchone()[0]
+            self._write_sentence_children(cursor, sentence_id, nos, tags)
+            return sentence_id
+
+    @staticmethod
+    def _write_sentence_children(cursor, sentence_id, nos, tags):
+        """重写句子的序号/标签子表行"""
+        cursor.execute(
+            "DELETE FROM sentence_no WHERE sentence_id = ?", (sentence_id,)
+        )
+        cursor.execute(
+            "DELETE FROM sentence_tag WHERE sentence_id = ?", (sentence_id,)
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO sentence_no (sentence_id, no) VALUES (?, ?)",
+            [(sentence_id, no) for no in nos or []],
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO sentence_tag (sentence_id, tag) VALUES (?, ?)",
+            [(sentence_id, tag) for tag in tags or []],
+        )
 
     def get_all_sentences(self, empty_word_filter: Optional[str] = None):
         """获取所有句子，支持虚词模糊搜索"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # 子表聚合成 JSON 数组，Python 侧一次 json.loads 还原
+            select_cols = """
+                SELECT s.*,
+                       (SELECT json_group_array(no) FROM sentence_no
+                        WHERE sentence_id = s.id) as nos,
+                       (SELECT json_group_array(tag) FROM sentence_tag
+                        WHERE sentence_id = s.id) as tags
+                FROM sentence s
+            """
             if empty_word_filter:
                 # 如果指定了虚词，查找包含该虚词的句子
                 cursor.execute(
-                    """
-                    SELECT DISTINCT s.* 
-                    FROM sentence s
+                    select_cols
+                    + """
                     JOIN example_sentence es ON s.id = es.sentence_id
                     WHERE es.empty_word = ?
+                    GROUP BY s.id
                     ORDER BY s.id
                 """,
                     (empty_word_filter,),
                 )
             else:
-                cursor.execute("SELECT * FROM sentence ORDER BY id")
+                cursor.execute(select_cols + " ORDER BY s.id")
 
             sentences = []
-            for row in cursor.fetchall():
+            for row in cursor:
                 sentence = dict(row)
-                sentence["nos"] = (
-                    [int(n) for n in row["nos"].split(",")] if row["nos"] else []
-                )
-                sentence["tags"] = row["tags"].split(",") if row["tags"] else []
+                sentence["nos"] = json.loads(row["nos"])
+                sentence["tags"] = json.loads(row["tags"])
                 sentences.append(sentence)
 
             return sentences
@@ -239,25 +596,16 @@ class Database:
         """更新句子"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            nos_str = ",".join(map(str, nos))
-            tags_str = ",".join(tags) if tags else ""
-
             cursor.execute(
-                """
-                UPDATE sentence
-                SET sentence = ?, nos = ?, tags = ?
-                WHERE id = ?
-            """,
-                (sentence, nos_str, tags_str, sentence_id),
+                "UPDATE sentence SET sentence = ? WHERE id = ?",
+                (sentence, sentence_id),
             )
+            self._write_sentence_children(cursor, sentence_id, nos, tags)
 
     def delete_sentence(self, sentence_id: int):
-        """删除句子"""
+        """删除句子（例句由外键级联删除）"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM example_sentence WHERE sentence_id = ?", (sentence_id,)
-            )
             cursor.execute("DELETE FROM sentence WHERE id = ?", (sentence_id,))
 
     # ExampleSentence CRUD
@@ -269,36 +617,83 @@ class Database:
             cursor = conn.cursor()
             tags_str = ",".join(tags) if tags else ""
             cursor.execute(
-                """
-                INSERT INTO example_sentence (sentence, tags, empty_word)
-                VALUES (?, ?, ?)
-            """,
-                (sentence, tags_str, empty_word),
+                _SQL_INSERT_EXAMPLE_SENTENCE, (sentence, tags_str, empty_word)
             )
             sentence_id = cursor.lastrowid
 
-            # 创建句子-用法关联
-            for i, action_id in enumerate(action_ids):
+            # 创建句子-用法关联（一条预编译语句批量绑定）
+            cursor.executemany(
+                _SQL_INSERT_SENTENCE_ACTION,
+                [(sentence_id, action_id) for action_id in action_ids],
+            )
+
+            return sentence_id
+
+    def create_example_sentences_bulk(self, rows):
+        """批量创建例句（单事务）
+
+        rows: [(sentence, tags, empty_word, action_ids), ...]
+        返回成功插入的例句数量
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            action_rows = []
+            count = 0
+
+            for sentence, tags, empty_word, action_ids in rows:
+                tags_str = ",".join(tags) if tags else ""
                 cursor.execute(
-                    """
-                    INSERT INTO sentence_action (sentence_id, action_id)
-                    VALUES (?, ?)
-                """,
-                    (sentence_id, action_id),
+                    _SQL_INSERT_EXAMPLE_SENTENCE, (sentence, tags_str, empty_word)
                 )
+                sentence_id = cursor.lastrowid
+                count += 1
 
-            return sentence_id
+                for action_id in action_ids:
+                    action_rows.append((sentence_id, action_id))
+
+            cursor.executemany(
+                _SQL_INSERT_SENTENCE_ACTION,
+                action_rows,
+            )
+
+            return count
 
     def get_all_example_sentences(
-        self, empty_word: Optional[str] = None, action_id: Optional[int] = None
+        self,
+        empty_word: Optional[str] = None,
+        action_id: Optional[int] = None,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        include_actions: bool = True,
     ):
-        """获取所有例句"""
+        """获取所有例句（limit/offset 用于分页）
+
+        include_actions=False 时只取 example_sentence 本表，
+        跳过两个 JOIN 和 GROUP BY，适合只展示句子文本的列表。
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+
+            if not include_actions and action_id is None:
+                query = "SELECT * FROM example_sentence"
+                params = []
+                if empty_word:
+                    query += " WHERE empty_word = ?"
+                    params.append(empty_word)
+                query += " ORDER BY id DESC"
+                if limit is not None:
+                    query += " LIMIT ? OFFSET ?"
+                    params.extend([limit, offset])
+                cursor.execute(query, tuple(params))
+                return [dict(row) for row in cursor]
+
+            # json_group_array 在 SQLite 内部一次拼好 JSON 数组，
+            # Python 侧只做一次 json.loads，免去逐元素 split+int
             query = """
-                SELECT es.*, 
-                       GROUP_CONCAT(DISTINCT ewa.id) as action_ids,
-                       GROUP_CONCAT(DISTINCT ewa.action) as actions
+                SELECT es.*,
+                       json_group_array(DISTINCT ewa.id) as action_ids,
+                       json_group_array(DISTINCT ewa.action) as actions
                 FROM example_sentence es
                 LEFT JOIN sentence_action sa ON es.id = sa.sentence_id
                 LEFT JOIN empty_word_action ewa ON sa.action_id = ewa.id
@@ -317,30 +712,124 @@ class Database:
                 query += " WHERE " + " AND ".join(conditions)
 
             query += " GROUP BY es.id ORDER BY es.id DESC"
+            if limit is not None:
+                query += " LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
             cursor.execute(query, tuple(params))
 
             sentences = []
-            for row in cursor.fetchall():
+            for row in cursor:
                 sentence = dict(row)
-                sentence["action_ids"] = (
-                    [int(id) for id in row["action_ids"].split(",")]
-                    if row["action_ids"]
-                    else []
+                # 无关联用法时 LEFT JOIN 产生 [null]，过滤掉
+                sentence["action_ids"] = [
+                    i for i in json.loads(row["action_ids"]) if i is not None
+                ]
+                sentence["actions"] = [
+                    a for a in json.loads(row["actions"]) if a is not None
+                ]
+                sentences.append(sentence)
+
+            return sentences
+
+    def count_example_sentences(self, empty_word: Optional[str] = None):
+        """统计例句数量"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if empty_word:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM example_sentence WHERE empty_word = ?",
+                    (empty_word,),
                 )
-                sentence["actions"] = (
-                    row["actions"].split(",") if row["actions"] else []
+            else:
+                cursor.execute("SELECT COUNT(*) FROM example_sentence")
+            return cursor.fetchone()[0]
+
+    def sample_sentences(
+        self,
+        empty_words: Optional[List[str]] = None,
+        pos_list: Optional[List[str]] = None,
+        limit: int = 30,
+    ):
+        """按条件随机抽取例句（过滤和抽样都在 SQL 内完成）"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = """
+                SELECT es.*,
+                       json_group_array(DISTINCT ewa.id) as action_ids,
+                       json_group_array(DISTINCT ewa.action) as actions
+                FROM example_sentence es
+                LEFT JOIN sentence_action sa ON es.id = sa.sentence_id
+                LEFT JOIN empty_word_action ewa ON sa.action_id = ewa.id
+            """
+            params = []
+            conditions = []
+
+            if empty_words:
+                placeholders = ",".join("?" * len(empty_words))
+                conditions.append(f"es.empty_word IN ({placeholders})")
+                params.extend(empty_words)
+            if pos_list:
+                placeholders = ",".join("?" * len(pos_list))
+                conditions.append(
+                    f"""EXISTS (
+                        SELECT 1 FROM empty_word_action p
+                        WHERE p.empty_word = es.empty_word
+                          AND p.part_of_speech IN ({placeholders})
+                    )"""
                 )
+                params.extend(pos_list)
+
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+
+            query += " GROUP BY es.id ORDER BY RANDOM() LIMIT ?"
+            params.append(limit)
+            cursor.execute(query, tuple(params))
+
+            sentences = []
+            for row in cursor:
+                sentence = dict(row)
+                # 无关联用法时 LEFT JOIN 产生 [null]，过滤掉
+                sentence["action_ids"] = [
+                    i for i in json.loads(row["action_ids"]) if i is not None
+                ]
+                sentence["actions"] = [
+                    a for a in json.loads(row["actions"]) if a is not None
+                ]
                 sentences.append(sentence)
 
             return sentences
 
     def get_example_sentence(self, sentence_id: int):
-        """获取单个例句"""
-        sentences = self.get_all_example_sentences()
-        for s in sentences:
-            if s["id"] == sentence_id:
-                return s
-        return None
+        """获取单个例句（按主键直接查询）"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT es.*,
+                       json_group_array(DISTINCT ewa.id) as action_ids,
+                       json_group_array(DISTINCT ewa.action) as actions
+                FROM example_sentence es
+                LEFT JOIN sentence_action sa ON es.id = sa.sentence_id
+                LEFT JOIN empty_word_action ewa ON sa.action_id = ewa.id
+                WHERE es.id = ?
+                GROUP BY es.id
+            """,
+                (sentence_id,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+
+            sentence = dict(row)
+            # 与 get_all_example_sentences 同口径：过滤 LEFT JOIN 的 null
+            sentence["action_ids"] = [
+                i for i in json.loads(row["action_ids"]) if i is not None
+            ]
+            sentence["actions"] = [
+                a for a in json.loads(row["actions"]) if a is not None
+            ]
+            return sentence
 
     def update_example_sentence(
         self,
@@ -368,53 +857,38 @@ class Database:
                 "DELETE FROM sentence_action WHERE sentence_id = ?", (sentence_id,)
             )
 
-            # 创建新关联
-            for action_id in action_ids:
-                cursor.execute(
-                    """
-                    INSERT INTO sentence_action (sentence_id, action_id)
-                    VALUES (?, ?)
-                """,
-                    (sentence_id, action_id),
-                )
+            # 创建新关联（一条预编译语句批量绑定）
+            cursor.executemany(
+                _SQL_INSERT_SENTENCE_ACTION,
+                [(sentence_id, action_id) for action_id in action_ids],
+            )
 
     def delete_example_sentence(self, sentence_id: int):
-        """删除例句"""
+        """删除例句（关联用法由外键级联删除）"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "DELETE FROM sentence_action WHERE sentence_id = ?", (sentence_id,)
-            )
             cursor.execute("DELETE FROM example_sentence WHERE id = ?", (sentence_id,))
 
     # 自动识别句子中的虚词
     def detect_empty_words_in_sentence(self, sentence: str):
-        """检测句子中包含的虚词"""
-        EMPTY_WORDS = [
-            "而",
-            "何",
-            "乎",
-            "乃",
-            "其",
-            "且",
-            "若",
-            "所",
-            "为",
-            "焉",
-            "也",
-            "以",
-            "因",
-            "于",
-            "与",
-            "则",
-            "者",
-            "之",
+        """检测句子中包含的虚词
+
+        frozenset 与句子字符一次 C 级求交，再按展示顺序过滤；
+        连正则引擎的状态机开销也省掉。
+        """
+        found = _EMPTY_WORDS_SET.intersection(sentence)
+        return [w for w in _EMPTY_WORDS if w in found]
+
+    def detect_empty_words_bulk(self, sentences: List[str]):
+        """批量检测多个句子中包含的虚词
+
+        返回与输入等长的列表，每项是该句命中的虚词（按展示顺序）。
+        单字虚词无需自动机，逐句 set 求交即可达到 O(总字数)。
+        """
+        return [
+            [w for w in _EMPTY_WORDS if w in chars]
+            for chars in (set(s) for s in sentences)
         ]
-        found_words = []
-        for word in EMPTY_WORDS:
-            if word in sentence:
-                found_words.append(word)
-        return found_words
 
     # Paper 和 Question 管理
     def create_paper(self, title: str, questions: List[Dict]):
@@ -430,31 +904,47 @@ class Database:
             )
             paper_id = cursor.lastrowid
 
+            if not questions:
+                return paper_id
+
+            # 多行 VALUES + RETURNING id（SQLite ≥3.35）：
+            # 一条语句插完全部题目并取回 ID，省掉逐题往返
+            question_params = []
             for order, question in enumerate(questions, 1):
-                cursor.execute(
-                    """
-                    INSERT INTO question (paper_id, sentence_id, action_id, question_order)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (paper_id, question["sentence_id"], question["action_id"], order),
+                question_params.extend(
+                    (paper_id, question["sentence_id"], question["action_id"], order)
                 )
-                question_id = cursor.lastrowid
+            cursor.execute(
+                "INSERT INTO question (paper_id, sentence_id, action_id, question_order) VALUES "
+                + ",".join(["(?, ?, ?, ?)"] * len(questions))
+                + " RETURNING id",
+                question_params,
+            )
+            question_ids = [row[0] for row in cursor.fetchall()]
+            # RETURNING 的输出顺序官方不作保证；同一条多行 INSERT 的
+            # rowid 按 VALUES 顺序分配，排序后即与 questions 对齐
+            question_ids.sort()
 
-                # 添加选项
+            option_rows = []
+            for question_id, question in zip(question_ids, questions):
                 for opt_order, option in enumerate(question.get("options", []), 1):
-                    cursor.execute(
-                        """
-                        INSERT INTO question_option (question_id, action_id, is_correct, option_order)
-                        VALUES (?, ?, ?, ?)
-                    """,
+                    option_rows.append(
                         (
                             question_id,
                             option["action_id"],
                             option["is_correct"],
                             opt_order,
-                        ),
+                        )
                     )
 
+            cursor.executemany(
+                """
+                INSERT INTO question_option (question_id, action_id, is_correct, option_order)
+                VALUES (?, ?, ?, ?)
+            """,
+                option_rows,
+            )
+
             return paper_id
 
     def get_all_papers(self):
@@ -462,7 +952,8 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM paper ORDER BY created_at DESC")
-            return [dict(row) for row in cursor.fetchall()]
+            # 调用方只按列名读字段，直接返回 Row 省一次整行复制
+            return cursor.fetchall()
 
     def get_paper(self, paper_id: int):
         """获取试卷详情"""
@@ -471,71 +962,57 @@ class Database:
             cursor.execute("SELECT * FROM paper WHERE id = ?", (paper_id,))
             paper = dict(cursor.fetchone())
 
-            # 获取题目
+            # 获取题目（action_id 就在 question 上，不需要 join sentence_action）
             cursor.execute(
                 """
-                SELECT q.*, es.sentence, sa.action_id
+                SELECT q.*, es.sentence
                 FROM question q
                 JOIN example_sentence es ON q.sentence_id = es.id
-                LEFT JOIN sentence_action sa ON es.id = sa.sentence_id
                 WHERE q.paper_id = ?
                 ORDER BY q.question_order
             """,
                 (paper_id,),
             )
-            questions = cursor.fetchall()
-
-            # 组装题目数据
-            question_dict = {}
-            for row in questions:
-                q_id = row["id"]
-                if q_id not in question_dict:
-                    question_dict[q_id] = {
-                        "id": q_id,
-                        "sentence_id": row["sentence_id"],
-                        "action_id": row["action_id"],
-                        "sentence": row["sentence"],
-                        "options": [],
-                        "question_order": row["question_order"],
-                    }
-
-                # 获取选项
-                cursor.execute(
-                    """
-                    SELECT ewa.*, qo.is_correct, qo.option_order
-                    FROM question_option qo
-                    JOIN empty_word_action ewa ON qo.action_id = ewa.id
-                    WHERE qo.question_id = ?
-                    ORDER BY qo.option_order
-                """,
-                    (q_id,),
-                )
-                options = [dict(row) for row in cursor.fetchall()]
-                question_dict[q_id]["options"] = options
+            question_rows = cursor.fetchall()
 
-            paper["questions"] = list(question_dict.values())
+            # 一次查询取回整卷选项，再按 question_id 分组
+            cursor.execute(
+                """
+                SELECT qo.question_id, ewa.*, qo.is_correct, qo.option_order
+                FROM question_option qo
+                JOIN empty_word_action ewa ON qo.action_id = ewa.id
+                JOIN question q ON qo.question_id = q.id
+                WHERE q.paper_id = ?
+                ORDER BY qo.question_id, qo.option_order
+            """,
+                (paper_id,),
+            )
+            options_by_q = defaultdict(list)
+            for row in cursor:
+                options_by_q[row["question_id"]].append(dict(row))
+
+            paper["questions"] = [
+                {
+                    "id": row["id"],
+                    "sentence_id": row["sentence_id"],
+                    "action_id": row["action_id"],
+                    "sentence": row["sentence"],
+                    "options": options_by_q.get(row["id"], []),
+                    "question_order": row["question_order"],
+                }
+                for row in question_rows
+            ]
             return paper
 
     def delete_paper(self, paper_id: int):
-        """删除试卷"""
+        """删除试卷（题目、选项由外键级联删除）"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id FROM question WHERE paper_id = ?", (paper_id,))
-            question_ids = [row[0] for row in cursor.fetchall()]
-
-            for q_id in question_ids:
-                cursor.execute(
-                    "DELETE FROM question_option WHERE question_id = ?", (q_id,)
-                )
-
-            cursor.execute("DELETE FROM question WHERE paper_id = ?", (paper_id,))
             cursor.execute("DELETE FROM paper WHERE id = ?", (paper_id,))
 
     # 初始化数据（从"所有句子.md"导入）
     def import_from_markdown(self, md_file: str):
         """从Markdown文件导入句子数据"""
-        import re
-
         # 句子字典，用于处理重复
         sentences_dict = {}
 
@@ -545,31 +1022,32 @@ class Database:
                 if not line:
                     continue
 
-                # 匹配格式：序号. 句子内容
-                match = re.match(r"^(\d+)\.\s+(.+)$", line)
+                match = _LINE_RE.match(line)
                 if match:
-                    no = int(match.group(1))
-                    sentence = match.group(2).strip()
-
-                    # 如果句子已存在，追加序号
-                    if sentence in sentences_dict:
-                        sentences_dict[sentence].append(no)
-                    else:
-                        sentences_dict[sentence] = [no]
+                    # 句子重复时 setdefault 一次哈希完成查找和追加
+                    sentences_dict.setdefault(match.group(2).strip(), []).append(
+                        int(match.group(1))
+                    )
 
-        # 导入到数据库
+        # 导入到数据库：行元组先建好，按表各一条 executemany 单事务写完
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT OR IGNORE INTO sentence (sentence) VALUES (?)",
+                [(sentence,) for sentence in sentences_dict],
+            )
 
-            for sentence, nos in sentences_dict.items():
-                nos_str = ",".join(map(str, nos))
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO sentence (sentence, nos, tags)
-                    VALUES (?, ?, ?)
-                """,
-                    (sentence, nos_str, ""),
-                )
+            # 取回句子 ID，再批量写序号子表
+            cursor.execute("SELECT sentence, id FROM sentence")
+            sentence_map = {row[0]: row[1] for row in cursor}
+            cursor.executemany(
+                "INSERT OR IGNORE INTO sentence_no (sentence_id, no) VALUES (?, ?)",
+                [
+                    (sentence_map[sentence], no)
+                    for sentence, nos in sentences_dict.items()
+                    for no in nos
+                ],
+            )
         print(f"成功导入 {len(sentences_dict)} 个句子")
 
     # 初始化数据（从JSON导入）
@@ -581,48 +1059,65 @@ class Database:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            # 导入 emptyWordActions
-            for ewa in data["emptyWordActions"]:
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO empty_word_action (id, empty_word, part_of_speech, action, translation)
-                    VALUES (?, ?, ?, ?, ?)
-                """,
+            # 导入 emptyWordActions：executemany 惰性消费生成器，
+            # 不在 Python 侧整表物化一份行列表
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO empty_word_action (id, empty_word, part_of_speech, action, translation)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (
                     (
                         ewa["id"],
                         ewa["emptyWord"],
                         ewa["partOfSpeech"],
                         ewa["action"],
                         ewa.get("translation", ""),
-                    ),
+                    )
+                    for ewa in data["emptyWordActions"]
+                ),
+            )
+
+            # 导入 exampleSentences（需要先找到句子ID），按固定批量
+            # 冲刷，常驻内存的行数有上界
+            batch_size = 500
+            es_rows = []
+            sa_rows = []
+
+            def flush():
+                cursor.executemany(
+                    """
+                    INSERT OR IGNORE INTO example_sentence (id, sentence_id, empty_word)
+                    VALUES (?, ?, ?)
+                """,
+                    es_rows,
                 )
+                cursor.executemany(
+                    """
+                    INSERT OR IGNORE INTO sentence_action (sentence_id, action_id)
+                    VALUES (?, ?)
+                """,
+                    sa_rows,
+                )
+                es_rows.clear()
+                sa_rows.clear()
+
+            # 句子→ID 映射一次查全，替代每条例句一次 SELECT
+            cursor.execute("SELECT sentence, id FROM sentence")
+            sentence_map = {row[0]: row[1] for row in cursor}
 
-            # 导入 exampleSentences（现在需要先找到句子ID）
             for es in data["exampleSentences"]:
-                # 首先查找句子ID
-                cursor.execute(
-                    "SELECT id FROM sentence WHERE sentence = ?", (es["sentence"],)
-                )
-                sentence_row = cursor.fetchone()
-
-                if sentence_row:
-                    sentence_id = sentence_row[0]
-                    cursor.execute(
-                        """
-                        INSERT OR IGNORE INTO example_sentence (id, sentence_id, empty_word)
-                        VALUES (?, ?, ?)
-                    """,
-                        (es["id"], sentence_id, es["emptyWord"]),
-                    )
+                sentence_id = sentence_map.get(es["sentence"])
 
-                    # 创建句子-用法关联
-                    cursor.execute(
-                        """
-                        INSERT OR IGNORE INTO sentence_action (sentence_id, action_id)
-                        VALUES (?, ?)
-                    """,
-                        (es["id"], es["actionId"]),
-                    )
+                if sentence_id is not None:
+                    es_rows.append((es["id"], sentence_id, es["emptyWord"]))
+                    sa_rows.append((es["id"], es["actionId"]))
+                    if len(es_rows) >= batch_size:
+                        flush()
+
+            flush()
+
+        self._ewa_cache.clear()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,86 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import bisect
+import dataclasses
 import json
 import re
+from dataclasses import dataclass
 from typing import Dict, List
 
+# 解析用正则统一在模块级编译一次，嵌套循环里直接复用
+_SECTION_RE = re.compile(r"^##\s+", re.MULTILINE)
+_TITLE_RE = re.compile(r"([一二三四五六七八九十]+)、(.+)")
+_POS_RE = re.compile(r"^###\s+(.+)$", re.MULTILINE)
+_USAGE_RE = re.compile(r"(\d+)\.\s*([^:：\n]+)[:：]([^\n]+)", re.MULTILINE)
+_NEXT_USAGE_RE = re.compile(r"\d+\.\s*")
+_SENTENCE_RE = re.compile(r"-\s*(.+?)(?=\n\s*-|\n\d+\.|\n###|$)")
+
+
+# 虚词映射表
+_WORD_MAP = {
+    "一": "而",
+    "二": "何",
+    "三": "乎",
+    "四": "乃",
+    "五": "其",
+    "六": "且",
+    "七": "若",
+    "八": "所",
+    "九": "为",
+    "十": "焉",
+    "十一": "也",
+    "十二": "以",
+    "十三": "因",
+    "十四": "于",
+    "十五": "与",
+    "十六": "则",
+    "十七": "者",
+    "十八": "之",
+}
+
+# 词性枚举映射
+_POS_MAP = {
+    "连词": "CONJUNCTION",
+    "副词": "ADVERB",
+    "介词": "PREPOSITION",
+    "代词": "PRONOUN",
+    "疑问代词": "PRONOUN",
+    "疑问副词": "ADVERB",
+    "动词": "VERB",
+    "名词": "NOUN",
+    "语气助词": "PARTICLE",
+    "句末语气词": "PARTICLE",
+    "句中语气词": "PARTICLE",
+    "语气词": "PARTICLE",
+    "形容词": "ADJECTIVE",
+    "助词": "AUXILIARY",
+    "复音虚词": "AUXILIARY",
+    "副音虚词": "AUXILIARY",
+    "兼词": "PRONOUN",
+    "指示代词": "PRONOUN",
+    "第三人称代词": "PRONOUN",
+    "形容词词尾": "PARTICLE",
+}
+
+
+# slots 记录代替逐条 dict：每条少一个哈希表，序列化时再按需转 dict
+@dataclass(slots=True)
+class EmptyWordAction:
+    id: int
+    emptyWord: str
+    partOfSpeech: str
+    action: str
+    translation: str
+
+
+@dataclass(slots=True)
+class ExampleSentence:
+    id: int
+    sentence: str
+    emptyWord: str
+    actionId: int
+
 
 def parse_markdown_to_json(filename: str = "虚词资料.md") -> Dict:
     """
@@ -23,52 +99,6 @@ def parse_markdown_to_json(filename: str = "虚词资料.md") -> Dict:
     with open(filename, "r", encoding="utf-8") as f:
         content = f.read()
 
-    # 虚词映射表
-    word_map = {
-        "一": "而",
-        "二": "何",
-        "三": "乎",
-        "四": "乃",
-        "五": "其",
-        "六": "且",
-        "七": "若",
-        "八": "所",
-        "九": "为",
-        "十": "焉",
-        "十一": "也",
-        "十二": "以",
-        "十三": "因",
-        "十四": "于",
-        "十五": "与",
-        "十六": "则",
-        "十七": "者",
-        "十八": "之",
-    }
-
-    # 词性枚举映射
-    pos_map = {
-        "连词": "CONJUNCTION",
-        "副词": "ADVERB",
-        "介词": "PREPOSITION",
-        "代词": "PRONOUN",
-        "疑问代词": "PRONOUN",
-        "疑问副词": "ADVERB",
-        "动词": "VERB",
-        "名词": "NOUN",
-        "语气助词": "PARTICLE",
-        "句末语气词": "PARTICLE",
-        "句中语气词": "PARTICLE",
-        "语气词": "PARTICLE",
-        "形容词": "ADJECTIVE",
-        "助词": "AUXILIARY",
-        "复音虚词": "AUXILIARY",
-        "副音虚词": "AUXILIARY",
-        "兼词": "PRONOUN",
-        "指示代词": "PRONOUN",
-        "第三人称代词": "PRONOUN",
-        "形容词词尾": "PARTICLE",
-    }
-
     empty_word_actions = []
     example_sentences = []
 
@@ -77,29 +107,25 @@ def parse_markdown_to_json(filename: str = "虚词资料.md") -> Dict:
 
     # 跳过开头的标题行 (# 虚词资料)
     # 按双井号分割每个虚词
-    sections = re.split(r"^##\s+", content, flags=re.MULTILINE)
+    sections = _SECTION_RE.split(content)
 
     for section in sections:
         # 跳过第一个可能包含文件标题的部分
-        if not re.match(r"([一二三四五六七八九十]+)、", section):
-            continue
         # 提取虚词序号和名称
         # 格式：一、而
-        title_match = re.match(
-            r"([一二三四五六七八九十]+)、(.+)", section.split("\n")[0]
-        )
+        title_match = _TITLE_RE.match(section.split("\n", 1)[0])
         if not title_match:
             continue
 
         word_sequence = title_match.group(1)
-        word_name = word_map.get(word_sequence, "")
+        word_name = _WORD_MAP.get(word_sequence, "")
 
         if not word_name:
             continue
 
         # 提取每个词性段落
         # 格式：### 连词
-        pos_paragraphs = re.split(r"^###\s+(.+)$", section, flags=re.MULTILINE)
+        pos_paragraphs = _POS_RE.split(section)
 
         # re.split的返回值结构：[分割符前的部分, 分割符匹配的内容, 分割符后的内容, ...]
         # 所以跳过第一个元素（标题），然后每两个元素组成一组（词性名+内容）
@@ -111,58 +137,55 @@ def parse_markdown_to_json(filename: str = "虚词资料.md") -> Dict:
             pos_content = pos_paragraphs[i + 1]
 
             # 提取词性枚举
-            pos_enum = pos_map.get(pos_name, pos_name.upper())
+            pos_enum = _POS_MAP.get(pos_name, pos_name.upper())
 
             # 提取用法段落
             # 格式：
             # 1. 并列：又
             #    - 例句1
             # 例句2
-            usage_pattern = r"(\d+)\.\s*([^:：\n]+)[:：]([^\n]+)"
-
-            for usage_match in re.finditer(usage_pattern, pos_content, re.MULTILINE):
+            # "数字." 边界一趟扫完，之后二分查找下一个，
+            # 不再对每个用法回扫一遍剩余文本
+            boundaries = [m.start() for m in _NEXT_USAGE_RE.finditer(pos_content)]
+            for usage_match in _USAGE_RE.finditer(pos_content):
                 usage_num = usage_match.group(1)
                 action_text = usage_match.group(2).strip()
                 translation = usage_match.group(3).strip()
 
                 # 获取该用法的全部内容（用于提取例句）
                 usage_start = usage_match.start()
-                # 查找下一个用法的位置
-                next_usage_match = re.search(
-                    r"\d+\.\s*", pos_content[usage_match.end() :]
-                )
-                if next_usage_match:
-                    usage_end = usage_match.end() + next_usage_match.start()
+                nxt = bisect.bisect_left(boundaries, usage_match.end())
+                if nxt < len(boundaries):
+                    usage_end = boundaries[nxt]
                 else:
                     usage_end = len(pos_content)
 
                 usage_block = pos_content[usage_start:usage_end]
 
                 empty_word_actions.append(
-                    {
-                        "id": action_id,
-                        "emptyWord": word_name,
-                        "partOfSpeech": pos_enum,
-                        "action": action_text,
-                        "translation": translation,
-                    }
+                    EmptyWordAction(
+                        id=action_id,
+                        emptyWord=word_name,
+                        partOfSpeech=pos_enum,
+                        action=action_text,
+                        translation=translation,
+                    )
                 )
 
                 # 提取该用法下的例句
                 # 格式：- 例句文本
-                sentence_pattern = r"-\s*(.+?)(?=\n\s*-|\n\d+\.|\n###|$)"
-                sentences = re.findall(sentence_pattern, usage_block)
+                sentences = _SENTENCE_RE.findall(usage_block)
 
                 for sentence in sentences:
                     sent = sentence.strip()
                     if sent:
                         example_sentences.append(
-                            {
-                                "id": sentence_id,
-                                "sentence": sent,
-                                "emptyWord": word_name,
-                                "actionId": action_id,
-                            }
+                            ExampleSentence(
+                                id=sentence_id,
+                                sentence=sent,
+                                emptyWord=word_name,
+                                actionId=action_id,
+                            )
                         )
                         sentence_id += 1
 
@@ -182,7 +205,10 @@ if __name__ == "__main__":
         # 输出JSON
         output_file = "虚词数据.json"
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            # default 回调逐条惰性转 dict，整表不用二次物化
+            json.dump(
+                data, f, ensure_ascii=False, indent=2, default=dataclasses.asdict
+            )
 
         print(f"✓ 成功解析 {len(data['emptyWordActions'])} 个虚词用法")
         print(f"✓ 成功解析 {len(data['exampleSentences'])} 个例句")
@@ -192,7 +218,7 @@ if __name__ == "__main__":
         from collections import Counter
 
         word_counts = Counter(
-            action["emptyWord"] for action in data["emptyWordActions"]
+            action.emptyWord for action in data["emptyWordActions"]
         )
 
         print("\n各虚词用法统计:")